@@ -0,0 +1,71 @@
+"""Shared HTTP session for the On3 / ESPN scrapers."""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Optional
+
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Simple browser UA so we don't look like a bot
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+HEADERS = {"User-Agent": USER_AGENT}
+
+# On-disk HTTP cache, anchored next to this module rather than the cwd.
+# Responses are reused for HTTP_CACHE_SECONDS (or per the server's
+# Cache-Control), then revalidated with If-None-Match / If-Modified-Since
+# so an unchanged page costs a 304.
+HTTP_CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "http_cache"
+HTTP_CACHE_SECONDS = 600
+
+_session: Optional[requests_cache.CachedSession] = None
+# Ingestion scrapes On3 and ESPN from different threads; build exactly once.
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests_cache.CachedSession:
+    session = requests_cache.CachedSession(
+        str(HTTP_CACHE_PATH),
+        backend="sqlite",
+        expire_after=HTTP_CACHE_SECONDS,
+        cache_control=True,
+    )
+    session.headers.update(HEADERS)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=2,  # one pool per host: On3 + ESPN
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
+def get_session() -> requests_cache.CachedSession:
+    """
+    Return the singleton keep-alive session used by every scraper.
+
+    One pooled TLS connection per host is reused across fetches; GETs back
+    off on rate limits / 5xx (honouring Retry-After), and once retries run
+    out the last response is returned so callers' status checks raise.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+    return _session
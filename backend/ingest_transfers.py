@@ -1,12 +1,18 @@
 """Ingestion pipeline for transfer portal players using On3 data and ESPN/other team metadata."""
 from __future__ import annotations
 
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
+import pandas as pd
+
 from on3_client import get_on3_transfers
 from team_client import get_fbs_teams  # <- your ESPN-based team client
 from supabase_client import get_supabase
-from tvi_engine import compute_tvi
+from tvi_engine import TVI_COMPONENTS, compute_tvi_batch
 
 
 # ---------------------------------------------------------
@@ -38,33 +44,103 @@ def _build_team_index(team_rows: Iterable[Dict]) -> Dict[str, Dict]:
     """
     Build a lookup so we can go from team name/short_name to the row's `id`
     in the Supabase `teams` table.
+
+    Keys are normalized once here with strip().casefold(); lookups must
+    normalize the same way.
     """
     index: Dict[str, Dict] = {}
     for row in team_rows:
-        if row.get("name"):
-            index[row["name"].strip().lower()] = row
-        if row.get("short_name"):
-            index[row["short_name"].strip().lower()] = row
+        name_key = (row.get("name") or "").strip().casefold()
+        short_key = (row.get("short_name") or "").strip().casefold()
+        if name_key:
+            index[name_key] = row
+        if short_key and short_key != name_key:
+            index[short_key] = row
     return index
 
 
-def _upsert_teams() -> Dict[str, Dict]:
+# FBS team metadata changes at most yearly, so warm runs skip the ESPN
+# scrape and the upsert. The cache stores name -> school_id only; Supabase
+# row ids are re-resolved with one select so they can never go stale.
+TEAM_CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+TEAM_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def _team_cache_path(year: int) -> Path:
+    return TEAM_CACHE_DIR / f"teams_{year}.json"
+
+
+def _load_cached_school_ids(year: int) -> Optional[Dict[str, int]]:
+    """Return the cached name -> school_id map for `year` if it exists and is fresh."""
+    path = _team_cache_path(year)
+    try:
+        if time.time() - path.stat().st_mtime > TEAM_CACHE_MAX_AGE_SECONDS:
+            return None
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _save_school_ids(year: int, team_index: Dict[str, Dict]) -> None:
+    path = _team_cache_path(year)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    school_ids = {key: row.get("school_id") for key, row in team_index.items()}
+    path.write_text(json.dumps(school_ids))
+
+
+def _resolve_school_ids(supabase, school_ids: Dict[str, int]) -> Optional[Dict[str, Dict]]:
+    """
+    Turn a cached name -> school_id map into a team index with current row
+    ids. Returns None if any school is missing, so the caller rebuilds.
+    """
+    response = (
+        supabase.table("teams")
+        .select("id, school_id")
+        .in_("school_id", sorted(set(school_ids.values())))
+        .execute()
+    )
+    rows_by_school = {row["school_id"]: row for row in response.data or []}
+
+    team_index: Dict[str, Dict] = {}
+    for key, school_id in school_ids.items():
+        row = rows_by_school.get(school_id)
+        if row is None:
+            return None
+        team_index[key] = row
+    return team_index
+
+
+def _upsert_teams(year: int) -> Dict[str, Dict]:
     """
     Pull teams from team_client (ESPN / static / whatever),
     upsert into Supabase, and return a lookup index.
+
+    With a fresh on-disk cache for `year`, the scrape and upsert are
+    skipped and ids come from a single select; delete the cache file to
+    force a refresh.
     """
     supabase = get_supabase()
+
+    cached = _load_cached_school_ids(year)
+    if cached:
+        team_index = _resolve_school_ids(supabase, cached)
+        if team_index:
+            return team_index
+
     teams = get_fbs_teams()  # <-- from team_client, NOT CFBD
     payload = [_normalize_team_payload(team) for team in teams if team]
 
     response = (
         supabase.table("teams")
-        .upsert(payload, on_conflict="school_id")
+        .upsert(payload, on_conflict="school_id", returning="representation")
         .execute()
     )
 
     data = response.data or []
-    return _build_team_index(data)
+    team_index = _build_team_index(data)
+    if team_index:
+        _save_school_ids(year, team_index)
+    return team_index
 
 
 # ---------------------------------------------------------
@@ -74,31 +150,47 @@ def _upsert_teams() -> Dict[str, Dict]:
 def _ensure_season(year: int) -> int:
     """
     Ensure a season row exists for `year` and return its id.
+
+    The upsert asks for the affected row back (return=representation), which
+    PostgREST sends for both inserts and conflict updates, so no follow-up
+    select is needed.
     """
     supabase = get_supabase()
     result = (
         supabase.table("seasons")
-        .upsert({"year": year}, on_conflict="year")
+        .upsert({"year": year}, on_conflict="year", returning="representation")
         .execute()
     )
 
-    if result.data and len(result.data) > 0:
-        return int(result.data[0]["id"])
+    if not result.data:
+        raise RuntimeError(f"Season upsert for {year} returned no row")
 
-    season_row = (
-        supabase.table("seasons")
-        .select("id")
-        .eq("year", year)
-        .single()
-        .execute()
-    )
-    return int(season_row.data["id"])
+    return int(result.data[0]["id"])
 
 
 # ---------------------------------------------------------
 # STATS NORMALIZATION (ZEROED FOR NOW)
 # ---------------------------------------------------------
 
+# No stats provider is wired to On3 players yet, so every stat line is zero.
+# Flip this on once real stats flow in; until then player_season_stats is
+# left untouched instead of receiving one all-zero row per player.
+ENABLE_STATS_WRITE = False
+
+# Zero-filled stat line shared by every player until stats are wired up.
+_ZERO_STATS: Dict[str, int] = {
+    "games_played": 0,
+    "snaps": 0,
+    "targets": 0,
+    "receptions": 0,
+    "yards": 0,
+    "tds": 0,
+    "tackles": 0,
+    "pass_breakups": 0,
+    "ints": 0,
+}
+
+
 def _normalize_stats(raw: Optional[Dict]) -> Dict:
     """
     For now, we don't have a stats provider wired to On3 players,
@@ -107,44 +199,104 @@ def _normalize_stats(raw: Optional[Dict]) -> Dict:
 
     Later: plug in an ESPN / NCAA stats provider and feed real `raw`.
     """
-    return {
-        "games_played": 0,
-        "snaps": 0,
-        "targets": 0,
-        "receptions": 0,
-        "yards": 0,
-        "tds": 0,
-        "tackles": 0,
-        "pass_breakups": 0,
-        "ints": 0,
-    }
+    return dict(_ZERO_STATS)
+
+
+def _has_stats(season_stats_payload: Dict) -> bool:
+    """True when any stat column in the payload is non-zero."""
+    return any(season_stats_payload.get(key) for key in _ZERO_STATS)
+
+
+# ---------------------------------------------------------
+# TRANSFER DEDUPLICATION
+# ---------------------------------------------------------
+
+def _dedupe_transfers(transfers: Iterable[Dict]) -> List[Dict]:
+    """
+    Drop repeated players before building payloads. On3 can list the same
+    player more than once (e.g. entered + committed cards). Without a CFBD
+    id we key on normalized name + position + origin team, so two players
+    sharing a name stay separate; the first occurrence wins. Cards with no
+    name can't be matched to anything and are skipped.
+    """
+
+    def norm(value) -> str:
+        return (value or "").strip().casefold()
+
+    seen = set()
+    deduped: List[Dict] = []
+    for t in transfers:
+        name = norm(t.get("player_name"))
+        if not name:
+            continue
+        key = (name, norm(t.get("position")), norm(t.get("on3_team")))
+        if key in seen:
+            continue
+        seen.add(key)
+        deduped.append(t)
+    return deduped
+
+
+# ---------------------------------------------------------
+# BATCH WRITE HELPERS
+# ---------------------------------------------------------
+
+# PostgREST rejects very large request bodies, so batch writes are chunked.
+UPSERT_CHUNK_SIZE = 500
+
+
+def _chunked(rows: List[Dict], size: int = UPSERT_CHUNK_SIZE) -> Iterable[List[Dict]]:
+    """Yield successive `size`-row slices of `rows`."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _write_transfer_batch(rows: List[Dict]) -> int:
+    """
+    Send ingestion rows to the `ingest_transfer_batch` SQL function
+    (see database/schema_v2.sql), one RPC call per chunk. Each row holds
+    `player`, `stats` (or None to skip) and `tvi` payloads; the database
+    writes them in a single transaction and links them by the new player id.
+    """
+    supabase = get_supabase()
+    processed = 0
+    for chunk in _chunked(rows):
+        response = supabase.rpc("ingest_transfer_batch", {"batch": chunk}).execute()
+        processed += int(response.data or 0)
+    return processed
 
 
 # ---------------------------------------------------------
 # MAIN INGESTION USING ON3 + TEAM CLIENT
 # ---------------------------------------------------------
 
-def ingest_transfers(year: int = 2024) -> Dict[str, int]:
+def ingest_transfers(year: int = 2024, pages: int = 1) -> Dict[str, int]:
     """
     Main entrypoint.
 
-    - Scrapes transfer players from On3 (via on3_client)
-    - Upserts FBS teams (via team_client)
-    - Ensures season exists
-    - Upserts players
-    - Inserts zeroed season stats row
-    - Computes and upserts TVI scores
+    - Scrapes `pages` wire pages of transfer players from On3 (via
+      on3_client), deduped by name + position + origin team, skipping
+      cards with no name
+    - Upserts FBS teams (via team_client) and ensures the season exists
+      while the On3 scrape is in flight
+    - Builds player and TVI payloads (season stats only when non-zero
+      and ENABLE_STATS_WRITE is on)
+    - Writes them in batches via the `ingest_transfer_batch` RPC
     """
-    supabase = get_supabase()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # 1) Start scraping portal players from On3 wire in the background
+        on3_future = pool.submit(get_on3_transfers, pages=pages)
 
-    # 1) Get portal players from On3 wire
-    transfers = get_on3_transfers()
+        # 2) Meanwhile, ensure teams + season are present
+        team_index = _upsert_teams(year)
+        season_id = _ensure_season(year)
 
-    # 2) Ensure teams + season are present
-    team_index = _upsert_teams()
-    season_id = _ensure_season(year)
+        # One row per player
+        transfers = _dedupe_transfers(on3_future.result())
 
-    processed = 0
+    players: List[Dict] = []
+    features: List[Dict] = []
+    season_stats: List[Dict] = []
 
     for t in transfers:
         # From on3_client.get_on3_transfers:
@@ -159,27 +311,27 @@ def ingest_transfers(year: int = 2024) -> Dict[str, int]:
         #   "status": ...,
         #   "entered_date": ...,
         #   "on3_team": ...,
-        #   "raw_lines": [...]
         # }
-        full_name = (t.get("player_name") or "").strip()
-        position = t.get("position")
-        class_year = t.get("class_year")
-        height = t.get("height")
-        weight = t.get("weight")
-        high_school = t.get("high_school")
-        rating = t.get("rating")
-        portal_status = t.get("status")
-        entered_date = t.get("entered_date")
-        on3_team = t.get("on3_team")
+        tget = t.get  # local alias; this loop runs once per transfer
+        full_name = (tget("player_name") or "").strip()
+        position = tget("position")
+        class_year = tget("class_year")
+        height = tget("height")
+        weight = tget("weight")
+        high_school = tget("high_school")
+        rating = tget("rating")
+        portal_status = tget("status")
+        entered_date = tget("entered_date")
+        on3_team = tget("on3_team")
 
         # Resolve the team_id in Supabase if we can match the name
         current_team_id = None
         if on3_team:
-            key = on3_team.strip().lower()
-            if key in team_index:
-                current_team_id = team_index[key].get("id")
+            team_row = team_index.get(on3_team.strip().casefold())
+            if team_row:
+                current_team_id = team_row.get("id")
 
-        # ---------------- PLAYER UPSERT (DB PAYLOAD) ----------------
+        # ---------------- PLAYER PAYLOAD (DB) ----------------
         # IMPORTANT: keep these keys consistent with your existing Supabase schema.
         # Original schema (from your previous code) used:
         #   full_name, position, height, weight, class_year,
@@ -204,76 +356,46 @@ def ingest_transfers(year: int = 2024) -> Dict[str, int]:
             "entered_portal": entered_date,
         }
 
-        # Upsert player; keep on_conflict as cfbd_player_id to match your schema.
-        # Because cfbd_player_id is always NULL now, upsert will behave like insert
-        # each run. That's fine for MVP; later you can add a unique index on full_name.
-        player_response = (
-            supabase.table("players")
-            .upsert(db_player_payload, on_conflict="cfbd_player_id")
-            .execute()
-        )
-
-        player_rows = player_response.data or []
-        if not player_rows:
-            # Fallback: fetch by full_name
-            player_rows = (
-                supabase.table("players")
-                .select("id")
-                .eq("full_name", full_name)
-                .limit(1)
-                .execute()
-                .data
-                or []
-            )
-
-        if not player_rows:
-            # Could not create or find player row; skip
-            continue
-
-        player_id = player_rows[0]["id"]
-
         # ---------------- SEASON STATS (ZEROED, FOR NOW) ----------------
-        stats_payload = _normalize_stats(None)
-
-        season_stats_payload = {
-            "player_id": player_id,
+        # player_id is filled in by the database once the player row exists.
+        season_stats_payload = _normalize_stats(None) | {
             "team_id": current_team_id,
             "season_id": season_id,
-            "games_played": stats_payload["games_played"],
-            "snaps": stats_payload["snaps"],
-            "targets": stats_payload["targets"],
-            "receptions": stats_payload["receptions"],
-            "yards": stats_payload["yards"],
-            "tds": stats_payload["tds"],
-            "tackles": stats_payload["tackles"],
-            "pass_breakups": stats_payload["pass_breakups"],
-            "ints": stats_payload["ints"],
             "raw_source": {},  # no real stats yet
         }
 
-        supabase.table("player_season_stats").upsert(
-            season_stats_payload,
-            on_conflict="player_id,season_id",
-        ).execute()
+        players.append(db_player_payload)
+        features.append(tvi_player_features)
+        season_stats.append(season_stats_payload)
 
-        # ---------------- TVI COMPUTATION ----------------
-        tvi_record = compute_tvi(stats_payload, tvi_player_features)
+    # ---------------- TVI COMPUTATION (ONE VECTORIZED PASS) ----------------
+    tvi_scores = compute_tvi_batch(pd.DataFrame(season_stats), pd.DataFrame(features))
+    tvi_values = tvi_scores["tvi"].tolist()
+    tvi_components = tvi_scores[list(TVI_COMPONENTS)].to_dict(orient="records")
 
+    batch_rows: List[Dict] = []
+    for db_player_payload, season_stats_payload, tvi, components in zip(
+        players, season_stats, tvi_values, tvi_components
+    ):
         tvi_payload = {
-            "player_id": player_id,
-            "team_id": current_team_id,
+            "team_id": season_stats_payload["team_id"],
             "season_id": season_id,
-            "tvi": tvi_record["tvi"],
-            "components": tvi_record["components"],
+            "tvi": tvi,
+            "components": components,
             "model_version": "v1",
         }
 
-        supabase.table("tvi_scores").upsert(
-            tvi_payload,
-            on_conflict="player_id,season_id,model_version",
-        ).execute()
+        write_stats = ENABLE_STATS_WRITE and _has_stats(season_stats_payload)
+
+        batch_rows.append(
+            {
+                "player": db_player_payload,
+                "stats": season_stats_payload if write_stats else None,
+                "tvi": tvi_payload,
+            }
+        )
 
-        processed += 1
+    processed = _write_transfer_batch(batch_rows)
 
     return {"processed": processed}
 
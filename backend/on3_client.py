@@ -7,7 +7,7 @@ public College Football Transfer Portal "wire" page:
     https://www.on3.com/transfer-portal/wire/football/
 
 This DOES NOT use any private API. It:
-- Downloads the HTML for the wire page
+- Downloads the HTML for the wire page (optionally several pages at once)
 - Parses the player cards
 - Extracts: position, name, class, height, weight, high school, rating,
   status, entered date, and associated college (if present)
@@ -17,97 +17,90 @@ This DOES NOT use any private API. It:
 from __future__ import annotations
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+from http_session import get_session
 
 WIRE_URL = "https://www.on3.com/transfer-portal/wire/football/"
 
-# Simple browser UA so we don't look like a bot
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/120.0.0.0 Safari/537.36"
+# Politeness cap on simultaneous requests when fetching several wire pages
+MAX_CONCURRENT_FETCHES = 8
+
+# Ratings render as e.g. '89.15'
+_RATING_RE = re.compile(r"^\d{2,3}\.\d{2}$")
+
+# 'RS-JR / 6-3 / 275' -> up to three '/'-separated, whitespace-trimmed fields;
+# anything after a third '/' is ignored
+_HEIGHT_WEIGHT_RE = re.compile(
+    r"^\s*([^/]*?)\s*(?:/\s*([^/]*?)\s*)?(?:/\s*([^/]*?)\s*)?(?:/|$)"
 )
 
 
-def _fetch_wire_html() -> str:
-    """Fetch the HTML for the On3 transfer portal wire page."""
-    resp = requests.get(
-        WIRE_URL,
-        headers={"User-Agent": USER_AGENT},
+def _fetch_wire_html(page: int = 1) -> str:
+    """Fetch the HTML for one page of the On3 transfer portal wire."""
+    resp = get_session().get(
+        WIRE_URL if page == 1 else f"{WIRE_URL}?page={page}",
         timeout=30,
     )
     if resp.status_code != 200:
+        # Decode only the bytes we show instead of the whole error body
+        snippet = resp.content[:400].decode("utf-8", "replace")
         raise RuntimeError(
-            f"On3 wire request failed: {resp.status_code} {resp.text[:400]}"
+            f"On3 wire request failed: {resp.status_code} {snippet}"
         )
     return resp.text
 
 
-def _parse_height_weight(line: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+def _fetch_wire_pages(pages: int) -> List[str]:
     """
-    Line example: 'RS-JR / 6-3 / 275'
-    Returns (class_year, height, weight)
+    Fetch wire pages 1..`pages` concurrently over the shared session and
+    return their HTML in page order. At most MAX_CONCURRENT_FETCHES requests
+    are in flight at once.
     """
-    parts = [p.strip() for p in line.split("/")]
+    if pages <= 1:
+        return [_fetch_wire_html()]
+    with ThreadPoolExecutor(max_workers=min(pages, MAX_CONCURRENT_FETCHES)) as pool:
+        return list(pool.map(_fetch_wire_html, range(1, pages + 1)))
 
-    class_year = parts[0] if len(parts) > 0 else None
-    height = parts[1] if len(parts) > 1 else None
-    weight = parts[2] if len(parts) > 2 else None
-    return class_year, height, weight
 
-
-def _extract_rating(lines: List[str]) -> Optional[float]:
+def _parse_wire_page(html: str) -> LexborHTMLParser:
     """
-    Find the first line that looks like a rating, e.g. '89.15'
+    Parse one wire page with <script>/<style> removed. Node.text() keeps
+    their contents (bs4's get_text() did not), and inline CSS-in-JS styles
+    inside a card would otherwise shift the position/name lines.
     """
-    for line in lines:
-        m = re.match(r"^\d{2,3}\.\d{2}$", line.strip())
-        if m:
-            try:
-                return float(m.group(0))
-            except ValueError:
-                continue
-    return None
+    dom = LexborHTMLParser(html)
+    dom.strip_tags(["script", "style"])
+    return dom
 
 
-def _extract_status_and_date(lines: List[str]) -> tuple[Optional[str], Optional[str]]:
+def _parse_height_weight(line: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
     """
-    Look for lines like:
-      'Entered 11/16/2025'
-      'Committed'
-      'Expected'
+    Line example: 'RS-JR / 6-3 / 275'
+    Returns (class_year, height, weight)
     """
-    status = None
-    date = None
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("Entered "):
-            status = "Entered"
-            date = line.replace("Entered ", "").strip()
-            break
-        if line in ("Committed", "Expected"):
-            # We'll keep last one found if multiple
-            status = line
-
-    return status, date
+    m = _HEIGHT_WEIGHT_RE.match(line)
+    if not m:
+        return None, None, None
+    class_year, height, weight = m.groups()
+    return class_year, height, weight
 
 
 def _extract_team_from_links(container) -> Optional[str]:
     """
     Try to get the college team name from the first '/college/' link in the card.
     """
-    college_link = container.find("a", href=re.compile(r"/college/"))
+    college_link = container.css_first('a[href*="/college/"]')
     if college_link:
-        text = college_link.get_text(strip=True)
+        text = college_link.text(strip=True)
         return text or None
     return None
 
 
-def _normalize_player_card(container) -> Optional[Dict[str, Any]]:
+def _normalize_player_card(container, debug: bool = False) -> Optional[Dict[str, Any]]:
     """
     Convert one player "card" container into a dict with normalized fields.
     We assume:
@@ -117,13 +110,13 @@ def _normalize_player_card(container) -> Optional[Dict[str, Any]]:
       - Somewhere below is 'High School (City, ST)'
       - Somewhere below is rating like '89.15'
       - Somewhere below is 'Entered mm/dd/yyyy' or 'Expected' / 'Committed'
+
+    With `debug`, the card's text lines are also returned under "raw_lines".
     """
     # Get all visible text in the container as separate lines
-    text_lines = [
-        t.strip()
-        for t in container.get_text(separator="\n").split("\n")
-        if t.strip()
-    ]
+    text_lines = list(
+        filter(None, (t.strip() for t in container.text(separator="\n").splitlines()))
+    )
 
     if len(text_lines) < 2:
         # too small to be a real player card
@@ -137,24 +130,47 @@ def _normalize_player_card(container) -> Optional[Dict[str, Any]]:
     height = None
     weight = None
     high_school = None
-    rating = _extract_rating(text_lines)
-    status, entered_date = _extract_status_and_date(text_lines)
-
-    # Parse class/year/height/weight from the first line containing '/'
-    for line in text_lines[2:]:
-        if "/" in line and any(ch.isdigit() for ch in line):
-            class_year, height, weight = _parse_height_weight(line)
-            break
-
-    # First line with parentheses is almost always "High School (City, ST)"
-    for line in text_lines[2:]:
-        if "(" in line and ")" in line:
-            high_school = line
+    rating = None
+    status = None
+    entered_date = None
+    found_class_line = False
+
+    # Single pass over the lines; every field keeps its original rule.
+    for i, line in enumerate(text_lines):
+        # First line that looks like a rating, e.g. '89.15'
+        if rating is None and _RATING_RE.match(line):
+            rating = float(line)
+
+        # 'Entered mm/dd/yyyy' wins outright; otherwise keep the last
+        # 'Committed' / 'Expected' seen
+        if status != "Entered":
+            if line.startswith("Entered "):
+                status = "Entered"
+                entered_date = line.replace("Entered ", "").strip()
+            elif line in ("Committed", "Expected"):
+                status = line
+
+        if i >= 2:
+            # Parse class/year/height/weight from the first line containing '/'
+            if not found_class_line and "/" in line and any(ch.isdigit() for ch in line):
+                class_year, height, weight = _parse_height_weight(line)
+                found_class_line = True
+
+            # First line with parentheses is almost always "High School (City, ST)"
+            if high_school is None and "(" in line and ")" in line:
+                high_school = line
+
+        if (
+            status == "Entered"
+            and rating is not None
+            and found_class_line
+            and high_school is not None
+        ):
             break
 
     team = _extract_team_from_links(container)
 
-    return {
+    player = {
         "player_name": name,
         "position": position,
         "class_year": class_year,
@@ -165,17 +181,24 @@ def _normalize_player_card(container) -> Optional[Dict[str, Any]]:
         "status": status,
         "entered_date": entered_date,
         "on3_team": team,
-        # Keep raw lines in case we want to debug or extend later
-        "raw_lines": text_lines,
     }
+    if debug:
+        # Raw lines help when debugging or extending the heuristics
+        player["raw_lines"] = text_lines
+    return player
 
 
-def get_on3_transfers(limit: int | None = None) -> List[Dict[str, Any]]:
+def get_on3_transfers(
+    limit: int | None = None,
+    pages: int = 1,
+    debug: bool = False,
+) -> List[Dict[str, Any]]:
     """
     Scrape the On3 transfer portal wire page and return a list of player dicts.
 
     For MVP:
-      - We only scrape the first page (latest transfers).
+      - By default we only scrape the first page (latest transfers);
+        `pages` > 1 downloads that many wire pages concurrently.
       - If `limit` is provided, we truncate the list.
 
     Each dict has keys:
@@ -189,18 +212,22 @@ def get_on3_transfers(limit: int | None = None) -> List[Dict[str, Any]]:
       - status
       - entered_date
       - on3_team
-      - raw_lines
+      - raw_lines (only when `debug` is true)
     """
-    html = _fetch_wire_html()
-    soup = BeautifulSoup(html, "html.parser")
-
     players: List[Dict[str, Any]] = []
 
     # Heuristic: each player name is linked to a /rivals/ profile, e.g.
     # https://www.on3.com/rivals/malachi-madison-81432/
-    player_links = soup.find_all("a", href=re.compile(r"/rivals/"))
+    # Keep every page's tree alive for the whole scan so node mem_ids stay
+    # unique across pages.
+    doms = [_parse_wire_page(html) for html in _fetch_wire_pages(pages)]
+    player_links = (link for dom in doms for link in dom.css('a[href*="/rivals/"]'))
 
     seen_names = set()
+    seen_names_add = seen_names.add
+    # A card usually holds two /rivals/ anchors (photo + name) under the same
+    # parent; only the first one needs its text extracted.
+    seen_containers = set()
 
     for link in player_links:
         # Climb to the card container. Parent is often enough, but we can
@@ -213,15 +240,19 @@ def get_on3_transfers(limit: int | None = None) -> List[Dict[str, Any]]:
         # (basic safeguard; we rely on text_lines length).
         card = container
 
-        player = _normalize_player_card(card)
+        if card.mem_id in seen_containers:
+            continue
+        seen_containers.add(card.mem_id)
+
+        player = _normalize_player_card(card, debug=debug)
         if not player:
             continue
 
         # Deduplicate by player_name + status + entered_date
-        key = (player["player_name"], player["status"], player["entered_date"])
+        key = f"{player['player_name']}|{player['status']}|{player['entered_date']}"
         if key in seen_names:
             continue
-        seen_names.add(key)
+        seen_names_add(key)
 
         players.append(player)
 
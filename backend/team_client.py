@@ -15,21 +15,18 @@ Returns a normalized list of FBS teams with:
 from __future__ import annotations
 
 import re
+import time
+from functools import lru_cache
 from typing import Dict, List
 
-import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+from http_session import HTTP_CACHE_SECONDS, get_session
 
 
 ESPN_TEAMS_URL = "https://www.espn.com/college-football/teams"
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-}
+_ESPN_ID_RE = re.compile(r"/id/(\d+)")
 
 
 def _extract_espn_id(url: str) -> int | None:
@@ -39,7 +36,7 @@ def _extract_espn_id(url: str) -> int | None:
 
     We extract the numeric ID after '/id/'.
     """
-    m = re.search(r"/id/(\d+)", url)
+    m = _ESPN_ID_RE.search(url)
     if m:
         return int(m.group(1))
     return None
@@ -49,6 +46,10 @@ def get_fbs_teams() -> List[Dict]:
     """
     Scrape the ESPN teams page and extract FBS teams grouped by conference.
 
+    Parsed results are memoized per HTTP_CACHE_SECONDS window, so repeated
+    calls within it skip both the request and the parse. The returned list
+    is shared between those calls; don't mutate it.
+
     Returns list of dicts:
       {
         "name": "Alabama",
@@ -58,51 +59,59 @@ def get_fbs_teams() -> List[Dict]:
         "logo_url": "https://a.espncdn.com/i/teamlogos/ncaa/500/333.png"
       }
     """
-    resp = requests.get(ESPN_TEAMS_URL, headers=HEADERS, timeout=30)
+    return _get_fbs_teams_for_window(int(time.time() // HTTP_CACHE_SECONDS))
+
+
+@lru_cache(maxsize=4)
+def _get_fbs_teams_for_window(window: int) -> List[Dict]:
+    """Fetch + parse the ESPN teams page; `window` only keys the cache."""
+    resp = get_session().get(ESPN_TEAMS_URL, timeout=30)
     if resp.status_code != 200:
         raise RuntimeError(f"Failed to fetch ESPN teams: {resp.status_code}")
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    dom = LexborHTMLParser(resp.text)
+    # Match bs4's get_text(): drop <script>/<style> contents from .text().
+    dom.strip_tags(["script", "style"])
 
     teams: List[Dict] = []
 
     # The ESPN page is structured with DIVs titled by conference,
     # followed by team cards inside UL lists.
-    conference_blocks = soup.find_all("div", class_="ContentList__Item")
+    conference_blocks = dom.css("div.ContentList__Item")
 
     for block in conference_blocks:
         # The conference name appears in an h2 or h3
-        h2 = block.find("h2")
-        h3 = block.find("h3")
+        h2 = block.css_first("h2")
+        h3 = block.css_first("h3")
         conference = None
 
         if h2:
-            conference = h2.get_text(strip=True)
+            conference = h2.text(strip=True)
         elif h3:
-            conference = h3.get_text(strip=True)
+            conference = h3.text(strip=True)
         else:
             continue
 
         # Now extract team cards inside this block
-        team_links = block.find_all("a", href=re.compile(r"/college-football/team/"))
+        team_links = block.css('a[href*="/college-football/team/"]')
 
         for link in team_links:
-            url = link.get("href", "")
+            url = link.attributes.get("href") or ""
             espn_id = _extract_espn_id(url)
             if not espn_id:
                 continue
 
             # Team name and short name are split inside divs
-            name_tag = link.find("span", class_="AnchorLink")
-            name = name_tag.get_text(strip=True) if name_tag else None
+            name_tag = link.css_first("span.AnchorLink")
+            name = name_tag.text(strip=True) if name_tag else None
 
             # ESPN renders the mascot "Crimson Tide" inside a second span
-            spans = link.find_all("span")
-            short_name = spans[-1].get_text(strip=True) if len(spans) > 1 else name
+            spans = link.css("span")
+            short_name = spans[-1].text(strip=True) if len(spans) > 1 else name
 
             # Logo
-            logo_img = link.find("img")
-            logo_url = logo_img.get("src") if logo_img else None
+            logo_img = link.css_first("img")
+            logo_url = logo_img.attributes.get("src") if logo_img else None
 
             if name:
                 teams.append(
@@ -3,6 +3,42 @@ from __future__ import annotations
 
 from typing import Dict
 
+import numpy as np
+import pandas as pd
+
+TVI_COMPONENTS = ("usage", "efficiency", "durability", "experience")
+
+# Experience score by normalized class year; anything else scores 0.5.
+_EXP_TABLE = {
+    "sr": 1.0,
+    "senior": 1.0,
+    "jr": 0.8,
+    "junior": 0.8,
+    "so": 0.6,
+    "soph": 0.6,
+    "sophomore": 0.6,
+    "fr": 0.4,
+    "freshman": 0.4,
+}
+
+
+# Formula pieces shared by the scalar and batch paths. Plain arithmetic, so
+# they work the same on floats and on NumPy arrays.
+USAGE_FULL_SNAPS = 800
+SEASON_GAMES = 12
+
+
+def _production(yards, tds, interceptions):
+    return yards + 20 * tds + 5 * interceptions
+
+
+def _durability(games):
+    return games / SEASON_GAMES
+
+
+def _combine(usage, efficiency, durability, experience):
+    return (usage + efficiency + durability + experience) / len(TVI_COMPONENTS)
+
 
 def _safe_divide(numerator: float, denominator: float) -> float:
     if denominator == 0:
@@ -13,36 +49,79 @@ def _safe_divide(numerator: float, denominator: float) -> float:
 def _experience_score(class_year: str | None) -> float:
     if not class_year:
         return 0.5
-    normalized = class_year.strip().lower()
-    if normalized in {"sr", "senior"}:
-        return 1.0
-    if normalized in {"jr", "junior"}:
-        return 0.8
-    if normalized in {"so", "soph", "sophomore"}:
-        return 0.6
-    if normalized in {"fr", "freshman"}:
-        return 0.4
-    return 0.5
+    return _EXP_TABLE.get(class_year.strip().lower(), 0.5)
 
 
 def compute_tvi(stats: Dict, player_meta: Dict) -> Dict[str, Dict[str, float] | float]:
+    """Score a single player with plain float math (see `compute_tvi_batch`)."""
     snaps = float(stats.get("snaps", 0) or 0)
     yards = float(stats.get("yards", 0) or 0)
     tds = float(stats.get("tds", 0) or 0)
     interceptions = float(stats.get("ints", 0) or 0)
     games = float(stats.get("games_played", 0) or 0)
 
-    usage = min(_safe_divide(snaps, 800), 1.0)
-    efficiency = _safe_divide(yards + 20 * tds + 5 * interceptions, snaps)
-    durability = _safe_divide(games, 12)
-    experience = _experience_score(player_meta.get("class_year"))
-
     components = {
-        "usage": usage,
-        "efficiency": efficiency,
-        "durability": durability,
-        "experience": experience,
+        "usage": min(snaps / USAGE_FULL_SNAPS, 1.0),
+        "efficiency": _safe_divide(_production(yards, tds, interceptions), snaps),
+        "durability": _durability(games),
+        "experience": _experience_score(player_meta.get("class_year")),
     }
-    tvi = sum(components.values()) / len(components)
+    tvi = _combine(**components)
 
     return {"tvi": tvi, "components": components}
+
+
+def _stat_column(stats_df: pd.DataFrame, name: str) -> np.ndarray:
+    """Numeric stat column as floats, with missing/None treated as 0."""
+    if name not in stats_df:
+        return np.zeros(len(stats_df))
+    return pd.to_numeric(stats_df[name], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def compute_tvi_batch(stats_df: pd.DataFrame, meta_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized TVI for a whole roster.
+
+    `stats_df` has one row per player (games_played, snaps, yards, tds, ints)
+    and `meta_df` the matching rows of player metadata (class_year).
+    Returns a DataFrame on `stats_df`'s index with a `tvi` column plus one
+    column per component.
+    """
+    snaps = _stat_column(stats_df, "snaps")
+    yards = _stat_column(stats_df, "yards")
+    tds = _stat_column(stats_df, "tds")
+    interceptions = _stat_column(stats_df, "ints")
+    games = _stat_column(stats_df, "games_played")
+
+    usage = np.minimum(snaps / USAGE_FULL_SNAPS, 1.0)
+    efficiency = np.divide(
+        _production(yards, tds, interceptions),
+        snaps,
+        out=np.zeros_like(snaps),
+        where=snaps != 0,
+    )
+    durability = _durability(games)
+
+    # Same lookup as _experience_score, vectorized. Casting to the pandas
+    # string dtype keeps .str usable for any column: None/NaN become <NA>,
+    # other non-strings are stringified; neither is in _EXP_TABLE, so both
+    # score 0.5.
+    class_years = pd.Series(
+        meta_df["class_year"].to_numpy() if "class_year" in meta_df else None,
+        index=stats_df.index,
+        dtype="object",
+    ).astype("string")
+    experience = (
+        class_years.str.strip().str.lower().map(_EXP_TABLE).fillna(0.5).to_numpy(dtype=float)
+    )
+
+    return pd.DataFrame(
+        {
+            "tvi": _combine(usage, efficiency, durability, experience),
+            "usage": usage,
+            "efficiency": efficiency,
+            "durability": durability,
+            "experience": experience,
+        },
+        index=stats_df.index,
+    )
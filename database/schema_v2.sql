@@ -0,0 +1,97 @@
+-- Additions on top of schema_v1.sql. Everything here is CREATE OR REPLACE,
+-- so the file is safe to re-run against an existing database.
+
+-- Ingests a batch of transfers in one transaction: each element carries a
+-- `player`, an optional `stats` and a `tvi` object; the new player id is
+-- threaded into the stats and TVI rows server-side. Returns the number of
+-- players written.
+CREATE OR REPLACE FUNCTION ingest_transfer_batch(batch JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    item JSONB;
+    new_player_id UUID;
+    processed INTEGER := 0;
+BEGIN
+    FOR item IN SELECT * FROM jsonb_array_elements(batch)
+    LOOP
+        -- cfbd_player_id is always NULL for On3 rows, so this is a plain insert.
+        INSERT INTO players (
+            full_name, position, height, weight, class_year,
+            hometown, prev_school, cfbd_player_id, current_team_id
+        )
+        SELECT
+            full_name, position, height, weight, class_year,
+            hometown, prev_school, cfbd_player_id, current_team_id
+        FROM jsonb_populate_record(NULL::players, item->'player')
+        RETURNING id INTO new_player_id;
+
+        -- `stats` is omitted (or null) when there is no real stat line to store.
+        IF jsonb_typeof(item->'stats') = 'object' THEN
+            INSERT INTO player_season_stats (
+                player_id, team_id, season_id, games_played, snaps, targets,
+                receptions, yards, tds, tackles, pass_breakups, ints, raw_source
+            )
+            SELECT
+                new_player_id, team_id, season_id, games_played, snaps, targets,
+                receptions, yards, tds, tackles, pass_breakups, ints, raw_source
+            FROM jsonb_populate_record(NULL::player_season_stats, item->'stats')
+            ON CONFLICT (player_id, season_id) DO UPDATE SET
+                team_id = EXCLUDED.team_id,
+                games_played = EXCLUDED.games_played,
+                snaps = EXCLUDED.snaps,
+                targets = EXCLUDED.targets,
+                receptions = EXCLUDED.receptions,
+                yards = EXCLUDED.yards,
+                tds = EXCLUDED.tds,
+                tackles = EXCLUDED.tackles,
+                pass_breakups = EXCLUDED.pass_breakups,
+                ints = EXCLUDED.ints,
+                raw_source = EXCLUDED.raw_source;
+        END IF;
+
+        INSERT INTO tvi_scores (
+            player_id, team_id, season_id, tvi, components, model_version
+        )
+        SELECT
+            new_player_id, team_id, season_id, tvi, components, model_version
+        FROM jsonb_populate_record(NULL::tvi_scores, item->'tvi')
+        ON CONFLICT (player_id, season_id, model_version) DO UPDATE SET
+            team_id = EXCLUDED.team_id,
+            tvi = EXCLUDED.tvi,
+            components = EXCLUDED.components;
+
+        processed := processed + 1;
+    END LOOP;
+
+    RETURN processed;
+END;
+$$;
+
+-- TVI scores joined with player and team details, so the app can load a
+-- season in a single request. security_invoker makes the views check the
+-- querying role's RLS policies rather than the view owner's.
+CREATE OR REPLACE VIEW v_tvi_full WITH (security_invoker = true) AS
+SELECT
+    s.id,
+    s.player_id,
+    s.team_id,
+    s.season_id,
+    s.tvi,
+    s.components,
+    s.model_version,
+    p.full_name AS player_name,
+    p.position,
+    t.name AS team_name,
+    t.conference
+FROM tvi_scores s
+LEFT JOIN players p ON p.id = s.player_id
+LEFT JOIN teams t ON t.id = s.team_id;
+
+-- Distinct filter values for the app sidebar.
+CREATE OR REPLACE VIEW v_conferences WITH (security_invoker = true) AS
+SELECT DISTINCT conference FROM teams WHERE conference <> '';
+
+CREATE OR REPLACE VIEW v_positions WITH (security_invoker = true) AS
+SELECT DISTINCT position FROM players WHERE position <> '';
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -15,95 +16,94 @@ def _supabase_client():
         st.stop()
 
 
-def fetch_seasons(client):
-    response = client.table("seasons").select("id, year").order("year", desc=True).execute()
+@st.cache_data(ttl=3600)
+def fetch_seasons(_client):
+    response = _client.table("seasons").select("id, year").order("year", desc=True).execute()
     seasons = response.data or []
     return seasons
 
 
-def fetch_conferences(client):
-    response = client.table("teams").select("conference").execute()
-    conferences = sorted({row.get("conference") for row in (response.data or []) if row.get("conference")})
-    return conferences
+@st.cache_data(ttl=3600)
+def fetch_conferences(_client):
+    response = _client.table("v_conferences").select("conference").order("conference").execute()
+    return [row["conference"] for row in (response.data or [])]
 
 
-def fetch_positions(client):
-    response = client.table("players").select("position").execute()
-    positions = sorted({row.get("position") for row in (response.data or []) if row.get("position")})
-    return positions
+@st.cache_data(ttl=3600)
+def fetch_positions(_client):
+    response = _client.table("v_positions").select("position").order("position").execute()
+    return [row["position"] for row in (response.data or [])]
 
 
-def fetch_tvi_scores(client, season_id):
+@st.cache_data(ttl=300)
+def fetch_tvi_full(_client, season_id):
     response = (
-        client.table("tvi_scores")
-        .select("id, player_id, team_id, season_id, tvi, components")
+        _client.table("v_tvi_full")
+        .select("player_id, team_id, tvi, components, player_name, position, team_name, conference")
         .eq("season_id", season_id)
         .execute()
     )
     return response.data or []
 
 
-def fetch_players(client, player_ids):
-    if not player_ids:
-        return {}
-    response = client.table("players").select("id, name, position").in_("id", list(player_ids)).execute()
-    return {row["id"]: row for row in (response.data or [])}
+@st.cache_data(ttl=300)
+def build_tvi_dataframe(_client, season_id):
+    tvi_rows = fetch_tvi_full(_client, season_id)
 
-
-def fetch_teams(client, team_ids):
-    if not team_ids:
-        return {}
-    response = client.table("teams").select("id, name, conference").in_("id", list(team_ids)).execute()
-    return {row["id"]: row for row in (response.data or [])}
-
-
-def build_tvi_dataframe(client, season_id):
-    tvi_rows = fetch_tvi_scores(client, season_id)
-    player_ids = {row["player_id"] for row in tvi_rows if row.get("player_id")}
-    team_ids = {row["team_id"] for row in tvi_rows if row.get("team_id")}
-
-    players = fetch_players(client, player_ids)
-    teams = fetch_teams(client, team_ids)
-
-    records = []
+    # Build column lists directly (one pass) rather than one dict per row.
+    player_ids, team_ids, player_names, positions = [], [], [], []
+    team_names, conferences, components = [], [], []
     for row in tvi_rows:
-        player = players.get(row.get("player_id"), {})
-        team = teams.get(row.get("team_id"), {})
-        records.append(
-            {
-                "player_id": row.get("player_id"),
-                "team_id": row.get("team_id"),
-                "Player": player.get("name", "Unknown"),
-                "Position": player.get("position", "-"),
-                "Team": team.get("name", "-"),
-                "Conference": team.get("conference", "-"),
-                "TVI": row.get("tvi"),
-                "components": row.get("components"),
-            }
-        )
-
-    df = pd.DataFrame(records)
+        player_ids.append(row.get("player_id"))
+        team_ids.append(row.get("team_id"))
+        player_names.append(row.get("player_name") or "Unknown")
+        positions.append(row.get("position") or "-")
+        team_names.append(row.get("team_name") or "-")
+        conferences.append(row.get("conference") or "-")
+        components.append(row.get("components"))
+
+    tvi_values = np.fromiter(
+        (np.nan if row.get("tvi") is None else row["tvi"] for row in tvi_rows),
+        dtype=float,
+        count=len(tvi_rows),
+    )
+
+    df = pd.DataFrame(
+        {
+            "player_id": player_ids,
+            "team_id": team_ids,
+            "Player": player_names,
+            "Position": positions,
+            "Team": team_names,
+            "Conference": conferences,
+            "TVI": tvi_values,
+            "components": components,
+        }
+    )
     return df
 
 
 def filter_dataframe(df, conferences, positions, minimum_tvi):
-    filtered = df.copy()
+    # One combined mask, so no intermediate frames are built per filter.
+    mask = np.ones(len(df), dtype=bool)
 
     if conferences:
-        filtered = filtered[filtered["Conference"].isin(conferences)]
+        mask &= df["Conference"].isin(conferences).to_numpy()
 
     if positions:
-        filtered = filtered[filtered["Position"].isin(positions)]
+        mask &= df["Position"].isin(positions).to_numpy()
 
     if minimum_tvi is not None:
-        filtered = filtered[filtered["TVI"] >= minimum_tvi]
+        mask &= (df["TVI"] >= minimum_tvi).to_numpy()
 
-    return filtered.sort_values(by="TVI", ascending=False)
+    return df[mask].sort_values(by="TVI", ascending=False, kind="stable")
 
 
-def fetch_player_stats(client, player_id, season_id):
+@st.cache_data(ttl=300)
+def fetch_player_stats(_client, player_id, season_id):
+    # Cached per (player, season) so re-selecting a player skips the round-trip.
     response = (
-        client.table("player_season_stats")
+        _client.table("player_season_stats")
         .select("*")
         .eq("player_id", player_id)
         .eq("season_id", season_id)
@@ -199,16 +199,15 @@ def main():
     st.write(f"Players after filtering: **{len(filtered_df)}**")
     st.dataframe(filtered_df[["Player", "Position", "Team", "Conference", "TVI"]])
 
-    player_options = filtered_df.to_dict(orient="records")
-    option_labels = {idx: f"{row['Player']} — {row['Team']}" for idx, row in enumerate(player_options)}
+    option_labels = (filtered_df["Player"].astype(str) + " — " + filtered_df["Team"].astype(str)).tolist()
     selection = st.selectbox(
         "Select player for detailed view",
-        options=list(option_labels.keys()),
+        options=range(len(option_labels)),
         format_func=lambda idx: option_labels[idx],
-    ) if player_options else None
+    ) if option_labels else None
 
-    if selection is not None and player_options:
-        player_row = player_options[selection]
+    if selection is not None:
+        player_row = filtered_df.iloc[selection].to_dict()
         display_player_details(client, player_row, selected_season_id)
 
 
@@ -0,0 +1,45 @@
+"""Parsing tests for the On3 wire scraper (no network)."""
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Backend modules import each other flat, as when run from backend/.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import on3_client  # noqa: E402
+
+# A card with inline CSS-in-JS <style> and a <script> ahead of the
+# position/name lines, as server-rendered pages sometimes emit.
+WIRE_HTML = """<html><body><ul>
+<li><div class="card"><style>.css-1x{color:red}</style><span>DL</span>
+<script>window.__x = 1;</script>
+<a href="https://www.on3.com/rivals/malachi-madison-81432/">Malachi Madison</a>
+<span>RS-JR / 6-3 / 275</span><span>Central High (Memphis, TN)</span>
+<span>89.15</span><span>Entered 11/16/2025</span>
+<a href="/college/alabama-crimson-tide/">Alabama</a></div></li>
+</ul></body></html>"""
+
+
+class GetOn3TransfersTest(unittest.TestCase):
+    def test_script_and_style_text_is_ignored(self):
+        with mock.patch.object(on3_client, "_fetch_wire_pages", return_value=[WIRE_HTML]):
+            players = on3_client.get_on3_transfers(debug=True)
+
+        self.assertEqual(len(players), 1)
+        player = players[0]
+        self.assertEqual(player["position"], "DL")
+        self.assertEqual(player["player_name"], "Malachi Madison")
+        self.assertEqual(player["class_year"], "RS-JR")
+        self.assertEqual(player["height"], "6-3")
+        self.assertEqual(player["weight"], "275")
+        self.assertEqual(player["high_school"], "Central High (Memphis, TN)")
+        self.assertEqual(player["rating"], 89.15)
+        self.assertEqual(player["status"], "Entered")
+        self.assertEqual(player["entered_date"], "11/16/2025")
+        self.assertEqual(player["on3_team"], "Alabama")
+        self.assertNotIn(".css-1x{color:red}", player["raw_lines"])
+
+
+if __name__ == "__main__":
+    unittest.main()